@@ -7,6 +7,7 @@
 # - "Penalty -10" button for each player that becomes enabled once that player has
 #   used every operator (or anytime if you prefer — toggle via ALLOW_PENALTY_ANYTIME)
 # - Single-file script. Requires: `pip install -U discord.py python-dotenv`
+#   (optional: `msgpack` for compact binary snapshots, `orjson` for faster JSON ones)
 #
 # Quick start
 # 1) Create a Discord application & bot (https://discord.com/developers/applications)
@@ -28,30 +29,57 @@
 from __future__ import annotations
 
 import os
+import sys
 import asyncio
+import functools
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Literal
+from typing import Dict, Iterable, Iterator, List, Literal
 
 import discord
 from discord import app_commands
 from dotenv import load_dotenv
-import io, json, time
+import hashlib, io, json, time, zlib
+
+try:  # faster snapshot (de)serialisation when available
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # compact binary snapshots when available; JSON otherwise
+    import msgpack
+except ImportError:
+    msgpack = None
 
 # Load environment variables from a .env file, if present
 load_dotenv()
 
 # ---- Channel persistence config ----
 STATE_CHANNEL_NAME = os.getenv("STATE_CHANNEL_NAME", "game-state")  # the channel name to store snapshots
+COMMAND_DIGEST_MARKER = "【siege-tracker commands】"  # state-channel message holding the last synced command digest
 STATE_SNAPSHOT_LIMIT = int(os.getenv("STATE_SNAPSHOT_LIMIT", "5"))    # keep last N snapshots per guild
 SAVE_MIN_INTERVAL = float(os.getenv("SAVE_MIN_INTERVAL", "10.0"))     # debounce saves (seconds)
 _LAST_SAVE: Dict[int, float] = {}
+_PENDING_SAVES: Dict[int, asyncio.Task] = {}  # background saves, see schedule_save
+_SNAPSHOTS: Dict[int, List[int]] = {}          # guild_id -> snapshot message ids, oldest first
+
+# ---- In-memory tracker eviction ----
+TRACKER_TTL = float(os.getenv("TRACKER_TTL", str(24 * 3600)))              # idle seconds before an orphaned tracker is dropped
+TRACKER_REAP_INTERVAL = float(os.getenv("TRACKER_REAP_INTERVAL", "3600"))  # how often to check (seconds)
 
 # ------------------------- Configuration ------------------------------------
 ALLOW_PENALTY_ANYTIME = True  # Set True to always enable the -10 buttons
-INTENTS = discord.Intents.default()  # No privileged intents required
+SYNC_COMMANDS = os.getenv("SYNC_COMMANDS", "1") == "1"  # set to 0 to skip slash-command sync on startup
+TEST_GUILD_ID = os.getenv("TEST_GUILD_ID")  # if set, sync commands to this guild only
+EDIT_DEBOUNCE = float(os.getenv("EDIT_DEBOUNCE", "0.15"))  # coalesce button bursts into one edit (seconds)
+# Only guild/channel events are needed: interactions arrive regardless of intents,
+# so skip message, typing, voice-state, reaction etc. dispatch entirely
+INTENTS = discord.Intents.none()
+INTENTS.guilds = True  # guild + channel cache for get_guild/get_channel
 
 # ------------------------- Operators (from user list) ------------------------
-ATTACKERS: List[str] = [
+# Names are interned so lookups against user input and history compare by identity
+ATTACKERS: List[str] = [sys.intern(n) for n in (
     "Rauora",
     "Striker*",
     "Deimos",
@@ -90,9 +118,9 @@ ATTACKERS: List[str] = [
     "IQ",
     "Fuze",
     "Glaz",
-]
+)]
 
-DEFENDERS: List[str] = [
+DEFENDERS: List[str] = [sys.intern(n) for n in (
     "Denari",
     "Skopós",
     "Sentry*",
@@ -131,37 +159,92 @@ DEFENDERS: List[str] = [
     "Bandit",
     "Tachanka",
     "Kapkan",
-]
+)]
 
 ALL_OPERATORS: List[str] = ATTACKERS + DEFENDERS
 ALL_COUNT = len(ALL_OPERATORS)
-ATT_SET = set(ATTACKERS)
-DEF_SET = set(DEFENDERS)
+RECENT_COUNT = 5  # operators shown in the "Last A/D" lines
+
+# Bitmask index over the fixed operator universe: bit i <-> OP_BY_INDEX[i]
+OP_BY_INDEX: List[str] = list(ALL_OPERATORS)
+OP_INDEX: Dict[str, int] = {op: i for i, op in enumerate(OP_BY_INDEX)}
+ATT_MASK = sum(1 << OP_INDEX[op] for op in ATTACKERS)
+DEF_MASK = sum(1 << OP_INDEX[op] for op in DEFENDERS)
+ALL_MASK = ATT_MASK | DEF_MASK
+# Fingerprint of the bit layout; snapshot masks are only trusted when it matches
+ROSTER_ID = zlib.crc32("\n".join(OP_BY_INDEX).encode("utf-8"))
+
+# The roster never changes at runtime, so sort it once instead of per interaction
+ALL_OPERATORS_SORTED: List[str] = sorted(ALL_OPERATORS)
+# Parallel to ALL_OPERATORS_SORTED: casefolded names and bitmask indices for autocomplete
+ALL_OPERATORS_SORTED_LC: List[str] = [n.casefold() for n in ALL_OPERATORS_SORTED]
+ALL_OPERATORS_SORTED_IDX: List[int] = [OP_INDEX[n] for n in ALL_OPERATORS_SORTED]
+AUTOCOMPLETE_LIMIT = 25  # Discord caps autocomplete responses at 25 choices
+
+def mask_of(ops: Iterable[str]) -> int:
+    """Bitmask with the bit of every given operator set."""
+    m = 0
+    for op in ops:
+        m |= 1 << OP_INDEX[op]
+    return m
+
+def iter_mask(m: int) -> Iterator[str]:
+    """Yield operator names for each set bit in `m`, lowest index first."""
+    while m:
+        b = m & -m
+        yield OP_BY_INDEX[b.bit_length() - 1]
+        m ^= b
 
 # ------------------------- Data Models --------------------------------------
-@dataclass
+@dataclass(slots=True)
 class PlayerState:
     name: str
     kills: int = 0
-    played: Set[str] = field(default_factory=set)
+    played: int = 0  # bitmask over OP_INDEX
     history: List[str] = field(default_factory=list)
+    # Most recent plays per side, newest first (rebuilt from history on load)
+    last_att: deque[str] = field(default_factory=lambda: deque(maxlen=RECENT_COUNT), init=False, repr=False, compare=False)
+    last_def: deque[str] = field(default_factory=lambda: deque(maxlen=RECENT_COUNT), init=False, repr=False, compare=False)
+    # (render key, rendered text) from the last format_player_block call
+    _cached_block: tuple | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for op in self.history:
+            self._note_recent(op)
+
+    def _note_recent(self, operator: str):
+        idx = OP_INDEX.get(operator)
+        if idx is None:
+            return
+        recent = self.last_att if (ATT_MASK >> idx) & 1 else self.last_def
+        if operator in recent:
+            recent.remove(operator)
+        recent.appendleft(operator)
 
     def add_play(self, operator: str) -> bool:
         """Add an operator to this player's played set and history. Returns False if already played."""
-        if operator in self.played:
+        bit = 1 << OP_INDEX[operator]
+        if self.played & bit:
             return False
-        self.played.add(operator)
+        self.played |= bit
         self.history.append(operator)
+        self._note_recent(operator)
         return True
 
-    def remaining_ops(self) -> Set[str]:
-        return set(ALL_OPERATORS) - self.played
+    def has_played(self, operator: str) -> bool:
+        return bool((self.played >> OP_INDEX[operator]) & 1)
+
+    def played_ops(self) -> Iterator[str]:
+        return iter_mask(self.played)
+
+    def remaining_mask(self) -> int:
+        return ALL_MASK & ~self.played
 
     def remaining_counts(self) -> tuple[int, int]:
-        rem = self.remaining_ops()
-        return len(rem & ATT_SET), len(rem & DEF_SET)
+        rem = self.remaining_mask()
+        return (rem & ATT_MASK).bit_count(), (rem & DEF_MASK).bit_count()
 
-@dataclass
+@dataclass(slots=True)
 class TrackerState:
     guild_id: int
     owner_id: int
@@ -169,62 +252,143 @@ class TrackerState:
     player2: PlayerState
     message_id: int | None = None
     channel_id: int | None = None
-    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    view: TrackerView | None = field(default=None, repr=False, compare=False)  # reused across edits
+    edit_lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+    last_activity: float = field(default_factory=time.monotonic, repr=False, compare=False)
+    # Embed skeleton reused for every edit; only the player fields are rewritten
+    base_embed: discord.Embed | None = field(default=None, repr=False, compare=False)
+    # What the tracker message currently shows, to skip edits that change nothing
+    _last_fields: tuple[tuple[str, str], ...] | None = field(default=None, init=False, repr=False, compare=False)
+    _last_buttons_state: tuple[bool, bool] | None = field(default=None, init=False, repr=False, compare=False)
+    # Pending debounced message edit (see schedule_flush)
+    _dirty: bool = field(default=False, init=False, repr=False, compare=False)
+    _flush_task: asyncio.Task | None = field(default=None, init=False, repr=False, compare=False)
+    # Resolved tracker channel/message, so edits skip get_channel
+    _channel: discord.abc.Messageable | None = field(default=None, init=False, repr=False, compare=False)
+    _message: discord.PartialMessage | None = field(default=None, init=False, repr=False, compare=False)
+    _players: Dict[str, PlayerState] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._players = {"P1": self.player1, "P2": self.player2}
 
     def player(self, key: Literal["P1", "P2"]) -> PlayerState:
-        return self.player1 if key == "P1" else self.player2
+        return self._players[key]
+
+    def touch(self):
+        self.last_activity = time.monotonic()
+
+class TrackerRegistry:
+    """guild_id -> TrackerState, with a background reaper for abandoned trackers.
 
-# guild_id -> TrackerState
-TRACKERS: Dict[int, TrackerState] = {}
+    A tracker is reaped once it has no tracker message (never posted, or found
+    deleted on edit) and has been idle for TRACKER_TTL seconds; trackers with a
+    live message are kept so their buttons keep working.
+    """
+    def __init__(self):
+        self._trackers: Dict[int, TrackerState] = {}
+        self._reaper: asyncio.Task | None = None
+
+    def get(self, guild_id: int) -> TrackerState | None:
+        return self._trackers.get(guild_id)
+
+    def set(self, guild_id: int, state: TrackerState):
+        state.touch()
+        self._trackers[guild_id] = state
+
+    def reap(self):
+        """Drop abandoned trackers now."""
+        cutoff = time.monotonic() - TRACKER_TTL
+        stale = [
+            gid for gid, st in self._trackers.items()
+            if st.message_id is None and st.last_activity < cutoff
+        ]
+        for gid in stale:
+            del self._trackers[gid]
+
+    def start_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+
+    async def _reap_loop(self):
+        while True:
+            await asyncio.sleep(TRACKER_REAP_INTERVAL)
+            self.reap()
+
+TRACKERS = TrackerRegistry()
+
+def _get_tracker(interaction: discord.Interaction) -> TrackerState | None:
+    """Active tracker for the interaction's guild, or None (also in DMs)."""
+    guild_id = interaction.guild_id
+    state = TRACKERS.get(guild_id) if guild_id is not None else None
+    if state is not None:
+        state.touch()
+    return state
 
 # ------------------------- Discord Channel Persistence ------------------------------------
 
 # Reuse the same serialize/deserialize helpers
 
+SNAPSHOT_VERSION = 2  # v2: played stored as a hex bitmask over OP_BY_INDEX
+
+def _serialize_player(p: PlayerState) -> dict:
+    return {
+        "name": p.name,
+        "kills": p.kills,
+        "played_mask": format(p.played, "x"),
+        "history": p.history,
+    }
+
+def _deserialize_player(d: dict, version: int, roster_matches: bool) -> PlayerState:
+    history = [sys.intern(op) for op in d.get("history", [])]
+    if version >= 2 and roster_matches:
+        played = int(d.get("played_mask", "0"), 16) & ALL_MASK
+    elif version >= 2:
+        # Operator list changed since this snapshot, so its bit positions are
+        # stale; every play is also in history, which is stored by name
+        played = mask_of(op for op in history if op in OP_INDEX)
+    else:
+        played = mask_of(op for op in d.get("played", []) if op in OP_INDEX)
+    return PlayerState(name=d["name"], kills=int(d["kills"]), played=played, history=history)
+
 def serialize_state(state: TrackerState) -> dict:
     return {
-        "version": 1,
+        "version": SNAPSHOT_VERSION,
         "guild_id": state.guild_id,
+        "roster": ROSTER_ID,
         "tracker": {
             "message_id": state.message_id,
             "channel_id": state.channel_id,
-            "player1": {
-                "name": state.player1.name,
-                "kills": state.player1.kills,
-                "played": sorted(list(state.player1.played)),
-                "history": state.player1.history,
-            },
-            "player2": {
-                "name": state.player2.name,
-                "kills": state.player2.kills,
-                "played": sorted(list(state.player2.played)),
-                "history": state.player2.history,
-            },
+            "player1": _serialize_player(state.player1),
+            "player2": _serialize_player(state.player2),
         },
     }
 
 def deserialize_state(data: dict) -> TrackerState:
-    p1 = data["tracker"]["player1"]
-    p2 = data["tracker"]["player2"]
+    version = int(data.get("version", 1))
+    roster_matches = data.get("roster") == ROSTER_ID
     return TrackerState(
         guild_id=int(data["guild_id"]),
         owner_id=0,
-        player1=PlayerState(
-            name=p1["name"],
-            kills=int(p1["kills"]),
-            played=set(p1.get("played", [])),
-            history=list(p1.get("history", [])),
-        ),
-        player2=PlayerState(
-            name=p2["name"],
-            kills=int(p2["kills"]),
-            played=set(p2.get("played", [])),
-            history=list(p2.get("history", [])),
-        ),
+        player1=_deserialize_player(data["tracker"]["player1"], version, roster_matches),
+        player2=_deserialize_player(data["tracker"]["player2"], version, roster_matches),
         message_id=data["tracker"].get("message_id"),
         channel_id=data["tracker"].get("channel_id"),
     )
 
+def encode_snapshot(data: dict) -> tuple[bytes, str]:
+    """Encode a snapshot, returning (payload, file extension)."""
+    if msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True), "msgpack"
+    if orjson is not None:
+        return orjson.dumps(data), "json"  # compact UTF-8 bytes
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), "json"
+
+def decode_snapshot(raw: bytes, ext: str) -> dict:
+    if ext == "msgpack":
+        return msgpack.unpackb(raw, raw=False)
+    # JSON snapshots, including ones written before the msgpack switch
+    return orjson.loads(raw) if orjson is not None else json.loads(raw.decode("utf-8"))
+
 async def get_state_channel(guild: discord.Guild) -> discord.TextChannel | None:
     if guild is None:
         return None
@@ -253,43 +417,61 @@ async def save_state_to_channel(client: discord.Client, state: TrackerState, for
     if ch is None:
         return
 
-    payload = json.dumps(serialize_state(state), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
-    filename = f"state-{state.guild_id}-{int(time.time())}.json"
+    payload, ext = encode_snapshot(serialize_state(state))
+    filename = f"state-{state.guild_id}-{int(time.time())}.{ext}"
+    if state.guild_id not in _SNAPSHOTS:
+        # Startup restore didn't run for this guild; list existing snapshots once
+        try:
+            _SNAPSHOTS[state.guild_id] = [m.id for m in reversed(await _scan_snapshots(client, ch))]
+        except Exception:
+            pass
     try:
-        await ch.send(content="【siege-tracker snapshot】", file=discord.File(io.BytesIO(payload), filename=filename))
+        sent = await ch.send(content="【siege-tracker snapshot】", file=discord.File(io.BytesIO(payload), filename=filename))
     except Exception:
         return
 
     # Optional cleanup: keep only the most recent N snapshots from this bot
-    try:
-        snapshots = []
-        async for msg in ch.history(limit=50):
-            if msg.author.id == client.user.id and msg.attachments and "siege-tracker snapshot" in (msg.content or ""):
-                snapshots.append(msg)
-        # Keep newest STATE_SNAPSHOT_LIMIT
-        snapshots.sort(key=lambda m: m.created_at, reverse=True)
-        for msg in snapshots[STATE_SNAPSHOT_LIMIT:]:
-            try:
-                await msg.delete()
-            except Exception:
-                pass
-    except Exception:
-        pass
+    ids = _SNAPSHOTS.setdefault(state.guild_id, [])
+    ids.append(sent.id)
+    drop = len(ids) - max(STATE_SNAPSHOT_LIMIT, 0)
+    if drop > 0:
+        stale = ids[:drop]
+        del ids[:drop]
+        # Delete in parallel; a failed delete (already gone, no perms) is ignored
+        await asyncio.gather(*(ch.get_partial_message(mid).delete() for mid in stale), return_exceptions=True)
+
+def schedule_save(client: discord.Client, state: TrackerState):
+    """Snapshot the tracker in the background so callers never wait on the upload."""
+    pending = _PENDING_SAVES.get(state.guild_id)
+    if pending is not None and not pending.done():
+        # A save is already uploading; cancelling it would lose that snapshot, and
+        # a new one would just hit the SAVE_MIN_INTERVAL debounce anyway
+        return
+    _PENDING_SAVES[state.guild_id] = asyncio.create_task(save_state_to_channel(client, state))
+
+async def _scan_snapshots(client: discord.Client, ch: discord.TextChannel) -> List[discord.Message]:
+    """This bot's snapshot messages among the channel's last 50, newest first."""
+    snapshots = []
+    async for msg in ch.history(limit=50):
+        if msg.author.id == client.user.id and msg.attachments and "siege-tracker snapshot" in (msg.content or ""):
+            snapshots.append(msg)
+    return snapshots
 
 async def load_state_from_channel(client: discord.Client, guild: discord.Guild):
     ch = await get_state_channel(guild)
     if ch is None:
         return
     try:
-        async for msg in ch.history(limit=50):
-            if msg.author.id != client.user.id or not msg.attachments:
-                continue
+        snapshots = await _scan_snapshots(client, ch)
+        # Remember them so saves can prune by id without rescanning the channel
+        _SNAPSHOTS[guild.id] = [m.id for m in reversed(snapshots)]
+        for msg in snapshots:
             for att in msg.attachments:
-                if att.filename.endswith(".json"):
-                    raw = await att.read()
-                    data = json.loads(raw.decode("utf-8"))
+                ext = att.filename.rsplit(".", 1)[-1]
+                if ext == "json" or (ext == "msgpack" and msgpack is not None):
+                    data = decode_snapshot(await att.read(), ext)
                     restored = deserialize_state(data)
-                    TRACKERS[guild.id] = restored
+                    TRACKERS.set(guild.id, restored)
                     try:
                         await update_tracker_message(client, restored)
                     except Exception:
@@ -395,19 +577,17 @@ class OperatorPickerView(discord.ui.View):
         # --- Rows 1-4: operator buttons in a grid (5 per row) ---
         def make_cb(op_name: str):
             async def _cb(interaction: discord.Interaction):
-                guild_id = interaction.guild_id
-                if guild_id is None or guild_id not in TRACKERS:
+                tracker = _get_tracker(interaction)
+                if tracker is None:
                     await interaction.response.send_message("No active tracker here. Use /tracker start first.", ephemeral=True)
                     return
-                tracker = TRACKERS[guild_id]
-                async with tracker.lock:
-                    player = tracker.player(self.player_key)
-                    if player.add_play(op_name):
-                        await update_tracker_message(interaction.client, tracker)
-                        await save_state_to_channel(interaction.client, tracker)
-                        note = f"Marked **{op_name}** as played for **{player.name}**."
-                    else:
-                        note = f"**{player.name}** already played **{op_name}**."
+                player = tracker.player(self.player_key)
+                if player.add_play(op_name):
+                    schedule_flush(interaction.client, tracker)
+                    schedule_save(interaction.client, tracker)
+                    note = f"Marked **{op_name}** as played for **{player.name}**."
+                else:
+                    note = f"**{player.name}** already played **{op_name}**."
 
                 # Rebuild to reflect disabled state, then update the ephemeral picker message
                 self._build()
@@ -415,7 +595,7 @@ class OperatorPickerView(discord.ui.View):
             return _cb
 
         for idx, op in enumerate(page_ops):
-            disabled = op in p.played
+            disabled = p.has_played(op)
             btn = discord.ui.Button(
                 label=op,
                 style=discord.ButtonStyle.blurple,
@@ -428,8 +608,8 @@ class OperatorPickerView(discord.ui.View):
     async def _edit(self, interaction: discord.Interaction, note: str | None = None):
         # Header content updates with counts & page index
         p = self.tracker.player(self.player_key)
-        pool = self._pool()
-        remaining_in_side = len(set(pool) - p.played)
+        side_mask = ATT_MASK if self.side == "A" else DEF_MASK
+        remaining_in_side = (p.remaining_mask() & side_mask).bit_count()
         header = (
             f"**{p.name}** — {self._side_name()} • Page {self.page + 1}/{self._total_pages} "
             f"• Remaining in side: {remaining_in_side}\n"
@@ -443,132 +623,267 @@ class OperatorPickerView(discord.ui.View):
             # Fallback if we've already responded somehow
             await interaction.edit_original_response(content=header, view=self)
 # ------------------------- UI Components ------------------------------------
+# (label, style, custom_id, player, kill delta) — in display order
+TRACKER_BUTTONS: tuple[tuple[str, discord.ButtonStyle, str, Literal["P1", "P2"], int], ...] = (
+    ("P1 +1 Kill", discord.ButtonStyle.success, "p1_plus", "P1", +1),
+    ("P1 -1 Kill", discord.ButtonStyle.secondary, "p1_minus", "P1", -1),
+    ("P1 Penalty -10", discord.ButtonStyle.danger, "penalty_p1", "P1", -10),
+    ("P2 +1 Kill", discord.ButtonStyle.success, "p2_plus", "P2", +1),
+    ("P2 -1 Kill", discord.ButtonStyle.secondary, "p2_minus", "P2", -1),
+    ("P2 Penalty -10", discord.ButtonStyle.danger, "penalty_p2", "P2", -10),
+)
+
 class TrackerView(discord.ui.View):
-    def __init__(self, tracker: TrackerState):
+    """Kill/penalty buttons for the tracker message.
+
+    The view holds no tracker: callbacks look the tracker up from the
+    interaction's guild. One instance is registered as a persistent view in
+    setup_hook, so buttons on existing messages keep working after a restart.
+    Each tracker still keeps its own instance to carry its penalty-button flags.
+    """
+    def __init__(self, tracker: TrackerState | None = None):
         super().__init__(timeout=None)
-        self.tracker = tracker
+        # custom_id -> Button
+        self.buttons: Dict[str, discord.ui.Button] = {}
+        for label, style, custom_id, which, delta in TRACKER_BUTTONS:
+            btn = discord.ui.Button(label=label, style=style, custom_id=custom_id)
+            btn.callback = functools.partial(self._adjust_kills, which=which, delta=delta)
+            self.buttons[custom_id] = btn
+            self.add_item(btn)
         # Initialize button states based on remaining operators
-        self.update_penalty_buttons()
+        if tracker is not None:
+            self.update_penalty_buttons(tracker)
 
     # ------ Helpers ------
-    def update_penalty_buttons(self):
-        p1_done = len(self.tracker.player1.remaining_ops()) == 0
-        p2_done = len(self.tracker.player2.remaining_ops()) == 0
-        for item in self.children:
-            if isinstance(item, discord.ui.Button):
-                if item.custom_id == "penalty_p1":
-                    item.disabled = (not ALLOW_PENALTY_ANYTIME) and (not p1_done)
-                elif item.custom_id == "penalty_p2":
-                    item.disabled = (not ALLOW_PENALTY_ANYTIME) and (not p2_done)
-
-    # ------ P1 Buttons ------
-    @discord.ui.button(label="P1 +1 Kill", style=discord.ButtonStyle.success, custom_id="p1_plus")
-    async def p1_plus(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self._adjust_kills(interaction, "P1", +1)
-
-    @discord.ui.button(label="P1 -1 Kill", style=discord.ButtonStyle.secondary, custom_id="p1_minus")
-    async def p1_minus(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self._adjust_kills(interaction, "P1", -1)
-
-    @discord.ui.button(label="P1 Penalty -10", style=discord.ButtonStyle.danger, custom_id="penalty_p1")
-    async def penalty_p1(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self._adjust_kills(interaction, "P1", -10)
-
-    # ------ P2 Buttons ------
-    @discord.ui.button(label="P2 +1 Kill", style=discord.ButtonStyle.success, custom_id="p2_plus")
-    async def p2_plus(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self._adjust_kills(interaction, "P2", +1)
-
-    @discord.ui.button(label="P2 -1 Kill", style=discord.ButtonStyle.secondary, custom_id="p2_minus")
-    async def p2_minus(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self._adjust_kills(interaction, "P2", -1)
-
-    @discord.ui.button(label="P2 Penalty -10", style=discord.ButtonStyle.danger, custom_id="penalty_p2")
-    async def penalty_p2(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self._adjust_kills(interaction, "P2", -10)
+    def update_penalty_buttons(self, tracker: TrackerState) -> tuple[bool, bool]:
+        """Refresh the penalty buttons' disabled flags and return them as (P1, P2)."""
+        p1_disabled = (not ALLOW_PENALTY_ANYTIME) and tracker.player1.remaining_mask() != 0
+        p2_disabled = (not ALLOW_PENALTY_ANYTIME) and tracker.player2.remaining_mask() != 0
+        self.buttons["penalty_p1"].disabled = p1_disabled
+        self.buttons["penalty_p2"].disabled = p2_disabled
+        return p1_disabled, p2_disabled
 
     # ------ Shared ------
     async def _adjust_kills(self, interaction: discord.Interaction, which: Literal["P1", "P2"], delta: int):
-        guild_id = interaction.guild_id
-        if guild_id is None or guild_id not in TRACKERS:
+        tracker = _get_tracker(interaction)
+        if tracker is None:
             await interaction.response.send_message("No active tracker here. Use /tracker start first.", ephemeral=True)
             return
-        tracker = TRACKERS[guild_id]
-        async with tracker.lock:
-            p = tracker.player(which)
-            p.kills = max(0, p.kills + delta)
-            # Update penalty button states in case something changed
-            self.update_penalty_buttons()
-            await update_tracker_message(interaction.client, tracker)
-            await save_state_to_channel(interaction.client, tracker)
-            try:
-                await interaction.response.defer()  # Acknowledge without extra message
-            except discord.InteractionResponded:
-                pass
+        # Acknowledge first so a slow handler can't blow the 3s deadline
+        try:
+            await interaction.response.defer()  # Acknowledge without extra message
+        except discord.InteractionResponded:
+            pass
+        p = tracker.player(which)
+        new_kills = max(0, p.kills + delta)
+        if new_kills == p.kills:
+            # Clamped at 0 (e.g. -1 with no kills): nothing to edit or save
+            return
+        p.kills = new_kills
+        # The flush refreshes the tracker's penalty-button state
+        schedule_flush(interaction.client, tracker)
+        schedule_save(interaction.client, tracker)
 
 # ------------------------- Bot & Commands -----------------------------------
 class SiegeTracker(discord.Client):
     def __init__(self):
-        super().__init__(intents=INTENTS)
+        # No member chunking and no message cache; the bot never reads either
+        super().__init__(intents=INTENTS, chunk_guilds_at_startup=False, max_messages=None)
         self.tree = app_commands.CommandTree(self)
+        self._commands_checked = False  # on_ready can fire again after reconnects
 
     async def setup_hook(self) -> None:
-        # Sync commands globally; for faster iteration, you can limit to a test guild
-        await self.tree.sync()
+        # One stateless view answers the tracker buttons on any message, by custom_id
+        self.add_view(TrackerView())
+        TRACKERS.start_reaper()
+
+    async def sync_commands_if_changed(self):
+        """Sync slash commands only when their schema differs from the last sync.
+
+        The digest of the last synced schema lives in a marker message in the
+        state channel (the test guild's, or the lowest-id guild's for a global
+        sync), so it survives redeploys. Runs from on_ready, once guilds exist.
+        """
+        if self._commands_checked or not SYNC_COMMANDS:
+            return
+
+        guild = None
+        if TEST_GUILD_ID:
+            # Guild-scoped sync applies instantly; handy while iterating on commands
+            guild = discord.Object(id=int(TEST_GUILD_ID))
+            self.tree.copy_global_to(guild=guild)
+
+        schema = [c.to_dict(self.tree) for c in self.tree.get_commands(guild=guild)]
+        digest = hashlib.sha1(
+            json.dumps([self.application_id, TEST_GUILD_ID, schema], sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        content = f"{COMMAND_DIGEST_MARKER} {digest}"
+
+        home = self.get_guild(guild.id) if guild else min(self.guilds, key=lambda g: g.id, default=None)
+        ch = await get_state_channel(home) if home is not None else None
+        marker = None
+        if ch is not None:
+            try:
+                async for msg in ch.history(limit=50):
+                    if msg.author.id == self.user.id and (msg.content or "").startswith(COMMAND_DIGEST_MARKER):
+                        marker = msg
+                        break
+            except Exception:
+                pass
+        if marker is not None and marker.content == content:
+            self._commands_checked = True
+            return
+
+        await self.tree.sync(guild=guild)
+        self._commands_checked = True
+        if ch is None:
+            return
+        try:
+            if marker is not None:
+                await marker.edit(content=content)
+            else:
+                await ch.send(content=content)
+        except Exception:
+            pass
 
 bot = SiegeTracker()
 
 # ---- Helpers to render/update the main message ----
 
 def format_player_block(p: PlayerState) -> str:
+    # Every mutation bumps kills, the played mask or the history length,
+    # so the key also covers the recent-play deques
+    key = (p.kills, p.played, len(p.history))
+    if p._cached_block is not None and p._cached_block[0] == key:
+        return p._cached_block[1]
+
     rem_att, rem_def = p.remaining_counts()
-    played_att = len(p.played & ATT_SET)
-    played_def = len(p.played & DEF_SET)
-
-    def last_from_history(side_set: Set[str], n: int = 5) -> str:
-        seen: Set[str] = set()
-        out: List[str] = []
-        for op in reversed(p.history):
-            if op in side_set and op not in seen:
-                out.append(op)
-                seen.add(op)
-            if len(out) >= n:
-                break
-        return ", ".join(out) if out else "—"
-
-    last_att = last_from_history(ATT_SET)
-    last_def = last_from_history(DEF_SET)
-
-    return (
+    played_att = len(ATTACKERS) - rem_att
+    played_def = len(DEFENDERS) - rem_def
+    played_total = played_att + played_def
+
+    last_att = ", ".join(p.last_att) or "—"
+    last_def = ", ".join(p.last_def) or "—"
+
+    block = (
         f"**Kills:** {p.kills}"
-        f"**Totals:** Played {len(p.played)} / {ALL_COUNT} • Remaining {ALL_COUNT - len(p.played)}"
+        f"**Totals:** Played {played_total} / {ALL_COUNT} • Remaining {ALL_COUNT - played_total}"
         f"**Attackers:** {played_att}/{len(ATTACKERS)} played • {rem_att} remaining"
         f"Last A: {last_att}"
         f"**Defenders:** {played_def}/{len(DEFENDERS)} played • {rem_def} remaining"
         f"Last D: {last_def}"
     )
+    p._cached_block = (key, block)
+    return block
+
+# Discord rejects the whole message (HTTP 400) if an embed exceeds these
+EMBED_FIELD_NAME_LIMIT = 256
+EMBED_FIELD_VALUE_LIMIT = 1024
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def render_player_fields(tracker: TrackerState) -> tuple[tuple[str, str], ...]:
+    """(name, value) for each player's embed field, in display order."""
+    # Player names are free text from /tracker start, so keep fields inside the limits.
+    # Two clipped fields plus title/description stay well under the 6000-char embed total.
+    return tuple(
+        (
+            _clip(f"{label} – {p.name}", EMBED_FIELD_NAME_LIMIT),
+            _clip(format_player_block(p), EMBED_FIELD_VALUE_LIMIT),
+        )
+        for label, p in (("Player 1", tracker.player1), ("Player 2", tracker.player2))
+    )
 
-async def update_tracker_message(client: discord.Client, tracker: TrackerState):
+def build_tracker_embed(tracker: TrackerState, fields: tuple[tuple[str, str], ...] | None = None) -> discord.Embed:
+    """The tracker's embed, built once and then updated in place."""
+    if fields is None:
+        fields = render_player_fields(tracker)
+    embed = tracker.base_embed
+    if embed is None:
+        embed = discord.Embed(title="🎯 2‑Player Siege Tracker", color=discord.Color.blurple())
+        embed.description = (
+            "Use **/tracker play** to mark an operator as played."
+            "Buttons adjust kills. Penalty buttons are always available (−10). Attackers/Defenders tracked separately."
+        )
+        for name, value in fields:
+            embed.add_field(name=name, value=value, inline=False)
+        tracker.base_embed = embed
+    else:
+        for i, (name, value) in enumerate(fields):
+            embed.set_field_at(i, name=name, value=value, inline=False)
+    return embed
+
+async def update_tracker_message(client: discord.Client, tracker: TrackerState, force: bool = False):
+    # The flush task, /tracker show and startup restore can all edit the same
+    # message; serialize them so edits land in order and the _last_* bookkeeping
+    # matches what Discord actually shows
+    async with tracker.edit_lock:
+        await _update_tracker_message(client, tracker, force)
+
+async def _update_tracker_message(client: discord.Client, tracker: TrackerState, force: bool):
     if tracker.channel_id is None or tracker.message_id is None:
         return
-    channel = client.get_channel(tracker.channel_id)
-    if not isinstance(channel, (discord.TextChannel, discord.Thread, discord.VoiceChannel)):
+
+    fields = render_player_fields(tracker)
+    if tracker.view is None:
+        # Restored from a snapshot: nothing has been attached yet
+        tracker.view = TrackerView(tracker)
+    buttons_state = tracker.view.update_penalty_buttons(tracker)
+    # Nothing visible changed (e.g. -1 at 0 kills): skip the REST round-trip
+    if not force and fields == tracker._last_fields and buttons_state == tracker._last_buttons_state:
         return
+    embed = build_tracker_embed(tracker, fields)
+
+    msg = tracker._message
+    if msg is None:
+        channel = tracker._channel
+        if channel is None:
+            channel = client.get_channel(tracker.channel_id)
+            if not isinstance(channel, (discord.TextChannel, discord.Thread, discord.VoiceChannel)):
+                return
+            tracker._channel = channel
+        # A PartialMessage can be edited by id alone; no GET needed
+        msg = tracker._message = channel.get_partial_message(tracker.message_id)
+
+    # The components only need re-sending when a penalty button flipped (or on a
+    # first/forced edit); otherwise Discord keeps the existing ones
+    if force or buttons_state != tracker._last_buttons_state:
+        edit_kwargs = {"embed": embed, "view": tracker.view}
+    else:
+        edit_kwargs = {"embed": embed}
     try:
-        msg = await channel.fetch_message(tracker.message_id)
+        await msg.edit(**edit_kwargs)
     except discord.NotFound:
+        # The tracker message was deleted: the tracker is orphaned and will be
+        # reaped once idle for TRACKER_TTL
+        tracker._message = None
+        tracker._channel = None
+        tracker.message_id = None
         return
-
-    embed = discord.Embed(title="🎯 2‑Player Siege Tracker", color=discord.Color.blurple())
-    embed.description = (
-        "Use **/tracker play** to mark an operator as played."
-        "Buttons adjust kills. Penalty buttons are always available (−10). Attackers/Defenders tracked separately."
-    )
-    embed.add_field(name=f"Player 1 – {tracker.player1.name}", value=format_player_block(tracker.player1), inline=False)
-    embed.add_field(name=f"Player 2 – {tracker.player2.name}", value=format_player_block(tracker.player2), inline=False)
-
-    view = TrackerView(tracker)
-    await msg.edit(embed=embed, view=view)
+    tracker._last_fields = fields
+    tracker._last_buttons_state = buttons_state
+
+def schedule_flush(client: discord.Client, tracker: TrackerState):
+    """Mark the tracker message stale and make sure one edit is queued for it."""
+    tracker._dirty = True
+    if tracker._flush_task is None or tracker._flush_task.done():
+        tracker._flush_task = asyncio.create_task(_debounced_flush(client, tracker))
+
+async def _debounced_flush(client: discord.Client, tracker: TrackerState):
+    # Let a burst of clicks land first, then push a single edit for all of them.
+    # Clicks that arrive while the edit is in flight are picked up by the next pass.
+    # State mutations never await, so the render always sees a consistent
+    # snapshot; update_tracker_message serializes against other editors.
+    while True:
+        await asyncio.sleep(EDIT_DEBOUNCE)
+        if not tracker._dirty:
+            return
+        tracker._dirty = False
+        try:
+            await update_tracker_message(client, tracker)
+        except Exception as e:
+            print(f"[flush] failed to update tracker message for guild {tracker.guild_id}: {e!r}")
 
 # ---- /tracker command group ----
 tracker_group = app_commands.Group(name="tracker", description="2‑Player R6S tracker")
@@ -586,49 +901,69 @@ async def tracker_start(interaction: discord.Interaction, player1: str, player2:
         player1=PlayerState(name=player1),
         player2=PlayerState(name=player2),
     )
-    TRACKERS[interaction.guild_id] = state
+    TRACKERS.set(interaction.guild_id, state)
 
     # Send initial message with view
-    embed = discord.Embed(title="🎯 2‑Player Siege Tracker", color=discord.Color.blurple())
-    embed.description = (
-        "Use **/tracker play** to mark an operator as played."
-        "Buttons adjust kills. Penalty buttons are always available (−10). Attackers/Defenders tracked separately."
-    )
-    embed.add_field(name=f"Player 1 – {state.player1.name}", value=format_player_block(state.player1), inline=False)
-    embed.add_field(name=f"Player 2 – {state.player2.name}", value=format_player_block(state.player2), inline=False)
-
-    view = TrackerView(state)
-    await interaction.response.send_message(embed=embed, view=view)
+    fields = render_player_fields(state)
+    embed = build_tracker_embed(state, fields)
+    state.view = TrackerView(state)
+    buttons_state = state.view.update_penalty_buttons(state)
+    await interaction.response.send_message(embed=embed, view=state.view)
     msg = await interaction.original_response()
     state.message_id = msg.id
     state.channel_id = msg.channel.id
+    state._channel = msg.channel
+    state._last_fields = fields
+    state._last_buttons_state = buttons_state
 
     # Persist initial state
     await save_state_to_channel(interaction.client, state, force=True)
 
+# Autocomplete results keyed by (played bitmask, casefolded query). The mask fully
+# determines the result, so any add_play naturally misses the cache; FIFO-capped.
+AUTOCOMPLETE_CACHE_SIZE = 256
+_AUTOCOMPLETE_CACHE: Dict[tuple[int, str], List[app_commands.Choice[str]]] = {}
+
+def _match_operators(played: int, query: str) -> List[app_commands.Choice[str]]:
+    # Prefix matches first, then the remaining substring matches. An empty query
+    # is a prefix of every name, so the second pass adds nothing in that case.
+    out: List[app_commands.Choice[str]] = []
+    for prefix_pass in (True, False):
+        for name, lc, idx in zip(ALL_OPERATORS_SORTED, ALL_OPERATORS_SORTED_LC, ALL_OPERATORS_SORTED_IDX):
+            if (played >> idx) & 1 or lc.startswith(query) is not prefix_pass:
+                continue
+            if not prefix_pass and query not in lc:
+                continue
+            out.append(app_commands.Choice(name=name, value=name))
+            if len(out) >= AUTOCOMPLETE_LIMIT:
+                return out
+    return out
+
 # Autocomplete for operator names (filters to remaining operators for selected player)
 async def op_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-    guild_id = interaction.guild_id
-    query = (current or "").strip().lower()
+    query = (current or "").strip().casefold()
 
     # Default to all operators if no state yet
-    ops_pool = ALL_OPERATORS
+    played = 0
 
-    if guild_id and guild_id in TRACKERS:
-        state = TRACKERS[guild_id]
+    state = _get_tracker(interaction)
+    if state is not None:
         # Which player was chosen in the same command?
         try:
             which: str = str(interaction.namespace.player)  # "P1" or "P2"
         except Exception:
             which = "P1"
         p = state.player(which) if which in ("P1", "P2") else state.player1
-        ops_pool = sorted(list(p.remaining_ops()))
-
-    if query:
-        ops_pool = [o for o in ops_pool if query in o.lower()]
+        played = p.played
 
-    # Return up to 25 choices as required by Discord
-    return [app_commands.Choice(name=o, value=o) for o in ops_pool[:25]]
+    key = (played, query)
+    choices = _AUTOCOMPLETE_CACHE.get(key)
+    if choices is None:
+        choices = _match_operators(played, query)
+        if len(_AUTOCOMPLETE_CACHE) >= AUTOCOMPLETE_CACHE_SIZE:
+            del _AUTOCOMPLETE_CACHE[next(iter(_AUTOCOMPLETE_CACHE))]  # drop the oldest entry
+        _AUTOCOMPLETE_CACHE[key] = choices
+    return choices
 
 # --- NEW: catch & surface errors from any slash command ---
 @bot.tree.error
@@ -658,18 +993,17 @@ async def tracker_play(
     if interaction.guild_id is None:
         await interaction.response.send_message("Run this in a server channel, not DMs.", ephemeral=True)
         return
-    if interaction.guild_id not in TRACKERS:
+    state = _get_tracker(interaction)
+    if state is None:
         await interaction.response.send_message("No active tracker here. Use /tracker start first.", ephemeral=True)
         return
 
-    state = TRACKERS[interaction.guild_id]
-
     # If no operator was typed, open the picker UI (ephemeral)
     if not operator:
         view = OperatorPickerView(state, player_key=player, side="A", page=0)
         p = state.player(player)
         await interaction.response.send_message(
-            content=f"**{p.name}** — Attackers • Page 1/… • Remaining in side: {len(set(ATTACKERS) - p.played)}\n"
+            content=f"**{p.name}** — Attackers • Page 1/… • Remaining in side: {(p.remaining_mask() & ATT_MASK).bit_count()}\n"
                     f"Tap an operator to mark it as played. (Played = disabled)",
             view=view,
             ephemeral=True,
@@ -677,34 +1011,38 @@ async def tracker_play(
         return
 
     # Text path (unchanged behavior)
-    async with state.lock:
-        if operator not in ALL_OPERATORS:
-            await interaction.response.send_message(f"`{operator}` isn't a recognized operator.", ephemeral=True)
-            return
-        p = state.player(player)
-        if not p.add_play(operator):
-            await interaction.response.send_message(f"{p.name} already played **{operator}**.", ephemeral=True)
-            return
-        await update_tracker_message(interaction.client, state)
-        await save_state_to_channel(interaction.client, state)
-        await interaction.response.send_message(f"Marked **{operator}** as played for **{p.name}**.", ephemeral=True)
+    idx = OP_INDEX.get(operator)
+    if idx is None:
+        await interaction.response.send_message(f"`{operator}` isn't a recognized operator.", ephemeral=True)
+        return
+    operator = OP_BY_INDEX[idx]  # canonical (interned) name
+    p = state.player(player)
+    if not p.add_play(operator):
+        await interaction.response.send_message(f"{p.name} already played **{operator}**.", ephemeral=True)
+        return
+    schedule_flush(interaction.client, state)
+    schedule_save(interaction.client, state)
+    await interaction.response.send_message(f"Marked **{operator}** as played for **{p.name}**.", ephemeral=True)
 
 
 
 # Optional: show current status again
 @tracker_group.command(name="show", description="Repost/update the tracker message if it went missing")
 async def tracker_show(interaction: discord.Interaction):
-    if interaction.guild_id is None or interaction.guild_id not in TRACKERS:
+    state = _get_tracker(interaction)
+    if state is None:
         await interaction.response.send_message("No active tracker here. Use /tracker start.", ephemeral=True)
         return
-    state = TRACKERS[interaction.guild_id]
-    async with state.lock:
-        await update_tracker_message(interaction.client, state)
+    await update_tracker_message(interaction.client, state, force=True)
     await interaction.response.send_message("Tracker refreshed.", ephemeral=True)
 
 # Restore state on startup for all guilds
 @bot.event
 async def on_ready():
+    try:
+        await bot.sync_commands_if_changed()
+    except Exception as e:
+        print(f"[sync] command sync failed: {e!r}")
     for g in bot.guilds:
         try:
             await load_state_from_channel(bot, g)